@@ -1,5 +1,5 @@
 """Agent configuration utilities."""
 
-from .schemas import get_response_format
+from .schemas import RESPONSE_FORMAT_BYTES, get_response_format, validate_agent_output
 
-__all__ = ["get_response_format"]
+__all__ = ["RESPONSE_FORMAT_BYTES", "get_response_format", "validate_agent_output"]
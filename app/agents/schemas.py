@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 
+import fastjsonschema
+import orjson
+
 FINANCIAL_REPORT_SCHEMA = {
     "name": "financial_reports",
     "schema": {
@@ -128,6 +132,31 @@ SCHEMA_PROFILES: dict[str, dict[str, Any]] = {
 }
 
 
+# Serialized once at import so run requests can splice them in without re-encoding.
+RESPONSE_FORMAT_BYTES: dict[str, bytes] = {
+    profile: orjson.dumps(response_format) for profile, response_format in SCHEMA_PROFILES.items()
+}
+
+
+# Compiled once per profile so any local validation of agent output reuses the same callable.
+_COMPILED_VALIDATORS: dict[str, Callable[[Any], Any]] = {
+    profile: fastjsonschema.compile(response_format["json_schema"]["schema"])
+    for profile, response_format in SCHEMA_PROFILES.items()
+}
+
+
 def get_response_format(profile: str) -> dict[str, Any] | None:
     """Return response_format payload for the given schema profile."""
     return SCHEMA_PROFILES.get(profile)
+
+
+def validate_agent_output(profile: str, data: Any) -> Any:
+    """Validate agent output against the schema profile, returning the data unchanged.
+
+    Profiles without a registered schema (such as ``"default"``) are not validated.
+    Raises ``fastjsonschema.JsonSchemaException`` when the output does not match.
+    """
+    validator = _COMPILED_VALIDATORS.get(profile)
+    if validator is None:
+        return data
+    return validator(data)
@@ -2,51 +2,129 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+import msgspec
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from starlette import status
 
+from app.api.responses import ORJSONResponse
 from app.config import Settings, get_settings
 from app.schemas import (
     AgentRunRequest,
     AgentRunResponse,
     FileUploadResponse,
+    RequestErrorResponse,
 )
 from app.services.agent_service import AgentService
 from app.storage import MetadataStore
 
 router = APIRouter(tags=["agents"])
 
+# Starlette renamed the 422 constant to match RFC 9110; fall back to the literal on older releases.
+_HTTP_422 = getattr(status, "HTTP_422_UNPROCESSABLE_CONTENT", 422)
+
+# msgspec reports where a value failed as a " - at `$.a.b[0]`" suffix, and names the offending
+# key ("missing required field `a`") for object-level errors raised on the enclosing object.
+_ERROR_PATH = re.compile(r" - at `\$(?P<path>[^`]*)`$")
+_ERROR_PATH_SEGMENT = re.compile(r"\.(?P<key>[^.\[]+)|\[(?P<index>\d+)\]|\[\.\.\.\]")
+_ERROR_FIELD = re.compile(r"(?:unknown|missing required) field `(?P<field>[^`]+)`")
 
-metadata_store: MetadataStore | None = None
+# The run body is decoded by msgspec rather than FastAPI, so its OpenAPI schema is emitted by msgspec too.
+_, _RUN_REQUEST_COMPONENTS = msgspec.json.schema_components(
+    (AgentRunRequest,), ref_template="#/components/schemas/{name}"
+)
+_RUN_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _RUN_REQUEST_COMPONENTS["AgentRunRequest"]}},
+    }
+}
+
+_ALLOWED_UPLOAD_TYPES: frozenset[str] = frozenset(
+    {
+        "text/csv",
+        "application/vnd.ms-excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    }
+)
 
 
-def get_metadata_store(settings: Settings = Depends(get_settings)) -> MetadataStore:
-    global metadata_store
-    if metadata_store is None:
-        metadata_store = MetadataStore(settings.database_path)
-    return metadata_store
+@lru_cache(maxsize=1)
+def build_metadata_store(database_path: Path) -> MetadataStore:
+    """Return the cached MetadataStore for the given database path."""
+    return MetadataStore(database_path)
+
+
+@lru_cache(maxsize=1)
+def _build_agent_service(
+    settings: Settings, client: httpx.AsyncClient, store: MetadataStore
+) -> AgentService:
+    return AgentService(settings=settings, client=client, store=store)
+
 
+async def _current_settings() -> Settings:
+    # Async wrapper so FastAPI resolves the cached settings inline rather than in the threadpool.
+    return get_settings()
 
-def get_agent_service(
-    settings: Settings = Depends(get_settings),
+
+async def get_metadata_store(settings: Settings = Depends(_current_settings)) -> MetadataStore:
+    """Dependency to provide the process-wide MetadataStore."""
+    return build_metadata_store(settings.database_path)
+
+
+async def get_agent_service(
+    request: Request,
+    settings: Settings = Depends(_current_settings),
     store: MetadataStore = Depends(get_metadata_store),
 ) -> AgentService:
-    """Dependency to provide AgentService with current settings."""
-    return AgentService(settings=settings, store=store)
+    """Dependency to provide the process-wide AgentService."""
+    return _build_agent_service(settings, request.app.state.http_client, store)
+
+
+def _error_location(message: str) -> tuple[list[str | int], str]:
+    """Split a msgspec error message into a FastAPI-style ``loc`` and the bare message."""
+    loc: list[str | int] = ["body"]
+    if match := _ERROR_PATH.search(message):
+        message = message[: match.start()]
+        for segment in _ERROR_PATH_SEGMENT.finditer(match["path"]):
+            if segment["key"] is not None:
+                loc.append(segment["key"])
+            elif segment["index"] is not None:
+                loc.append(int(segment["index"]))
+            else:
+                # Mapping values are reported as "[...]" without their key; stop at the mapping.
+                break
+    if match := _ERROR_FIELD.search(message):
+        loc.append(match["field"])
+    return loc, message
+
+
+def _request_error(exc: msgspec.DecodeError, error_type: str) -> HTTPException:
+    # Keep FastAPI's list-of-errors shape so clients parse msgspec failures the same way.
+    loc, message = _error_location(str(exc))
+    return HTTPException(
+        status_code=_HTTP_422,
+        detail=[{"loc": loc, "msg": message, "type": error_type}],
+    )
 
 
 @router.post(
     "/uploads",
-    response_model=FileUploadResponse,
+    response_model=None,
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": FileUploadResponse}},
     summary="Upload a CSV/XLSX file and forward to OpenAI Files API.",
 )
 async def upload_file(
     file: UploadFile = File(..., description="CSV or XLSX export to analyze."),
     provider: str | None = None,
     service: AgentService = Depends(get_agent_service),
-) -> FileUploadResponse:
-    if file.content_type not in {"text/csv", "application/vnd.ms-excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}:
+) -> ORJSONResponse:
+    if file.content_type not in _ALLOWED_UPLOAD_TYPES:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail="Only CSV or XLSX files are supported.",
@@ -55,20 +133,31 @@ async def upload_file(
         result = await service.upload_source(file=file, provider=provider)
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return FileUploadResponse(**result)
+    return ORJSONResponse(result, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
     "/runs",
-    response_model=AgentRunResponse,
+    response_model=None,
+    responses={
+        status.HTTP_200_OK: {"model": AgentRunResponse},
+        _HTTP_422: {"model": RequestErrorResponse, "description": "Validation Error"},
+    },
     summary="Create an agent run with uploaded file attachments.",
+    openapi_extra=_RUN_REQUEST_OPENAPI,
 )
 async def create_run(
-    request: AgentRunRequest,
+    http_request: Request,
     service: AgentService = Depends(get_agent_service),
-) -> AgentRunResponse:
+) -> ORJSONResponse:
+    try:
+        request = msgspec.json.decode(await http_request.body(), type=AgentRunRequest)
+    except msgspec.ValidationError as exc:
+        raise _request_error(exc, "value_error") from exc
+    except msgspec.DecodeError as exc:
+        raise _request_error(exc, "json_invalid") from exc
     try:
         run = await service.start_agent_run(request=request)
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    return AgentRunResponse(**run)
+    return ORJSONResponse(run)
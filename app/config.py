@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Literal
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Settings:
     """Runtime settings sourced from environment variables."""
 
@@ -25,14 +25,15 @@ class Settings:
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Return cached runtime settings."""
+    defaults = Settings()
     cors_origins = os.getenv("CORS_ALLOW_ORIGINS", "").strip()
     origins: tuple[str, ...]
     if cors_origins:
         origins = tuple(origin.strip() for origin in cors_origins.split(",") if origin.strip())
     else:
-        origins = Settings.cors_allow_origins
+        origins = defaults.cors_allow_origins
 
-    data_dir = Path(os.getenv("DATA_DIRECTORY", Settings.data_directory.as_posix())).expanduser()
+    data_dir = Path(os.getenv("DATA_DIRECTORY", defaults.data_directory.as_posix())).expanduser()
     data_dir.mkdir(parents=True, exist_ok=True)
     database_path_str = os.getenv("DATABASE_PATH")
     if database_path_str:
@@ -42,9 +43,9 @@ def get_settings() -> Settings:
         database_path = data_dir / "metadata.db"
 
     return Settings(
-        environment=os.getenv("ENVIRONMENT", Settings.environment),
+        environment=os.getenv("ENVIRONMENT", defaults.environment),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
-        openai_base_url=os.getenv("OPENAI_BASE_URL", Settings.openai_base_url),
+        openai_base_url=os.getenv("OPENAI_BASE_URL", defaults.openai_base_url),
         openai_assistant_id=os.getenv("OPENAI_ASSISTANT_ID"),
         cors_allow_origins=origins,
         data_directory=data_dir,
@@ -2,13 +2,38 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.responses import ORJSONResponse
+from .api.routes import build_metadata_store
 from .api.routes import router as api_router
 from .config import get_settings
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Prepare shared resources before serving requests and release them on shutdown."""
+    settings = get_settings()
+    store = build_metadata_store(settings.database_path)
+    await store.start()
+    app.state.http_client = httpx.AsyncClient(
+        base_url=settings.openai_base_url,
+        timeout=60.0,
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+        await store.aclose()
+
+
 def create_app() -> FastAPI:
     """Application factory used by uvicorn."""
     settings = get_settings()
@@ -16,6 +41,8 @@ def create_app() -> FastAPI:
         title="Accounting Agents Backend",
         version="0.1.0",
         description="Staging backend skeleton providing upload and agent orchestration endpoints.",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
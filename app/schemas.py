@@ -1,16 +1,26 @@
-"""Pydantic models for API requests and responses."""
+"""Request and response models for the API.
+
+Responses are pydantic models; the run request is a msgspec struct decoded directly from the body.
+"""
 
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Literal
+
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 
-from pydantic import BaseModel, Field, HttpUrl
+# The pydantic models only document responses in OpenAPI (routes return ORJSONResponse directly),
+# so the sole effect of forbidding extras is ``additionalProperties: false`` in their schemas.
+_MODEL_CONFIG = ConfigDict(extra="forbid")
 
 
 class FileUploadResponse(BaseModel):
     """Response returned when a file is uploaded and forwarded to OpenAI."""
 
+    model_config = _MODEL_CONFIG
+
     file_id: str = Field(..., description="Identifier returned by OpenAI Files API.")
     filename: str
     provider: str | None = Field(default=None, description="Optional provider hint supplied by the caller.")
@@ -19,29 +29,34 @@ class FileUploadResponse(BaseModel):
     uploaded_at: datetime
 
 
-class AgentRunRequest(BaseModel):
+class AgentRunRequest(msgspec.Struct, frozen=True, forbid_unknown_fields=True):
     """Request payload used to start an agent run."""
 
-    file_ids: list[str] = Field(..., min_items=1, description="Files previously uploaded via /uploads.")
-    instructions: str = Field(
-        ...,
-        description="Custom instructions to include alongside the system prompt.",
-    )
-    response_schema: Literal["default", "income_cashflow_expense"] = Field(
-        default="income_cashflow_expense",
-        description="Schema profile the agent should satisfy.",
-    )
-    metadata: dict[str, str] | None = Field(default=None, description="Optional metadata stored with the run.")
+    file_ids: Annotated[
+        list[str], msgspec.Meta(min_length=1, description="Files previously uploaded via /uploads.")
+    ]
+    instructions: Annotated[
+        str, msgspec.Meta(description="Custom instructions to include alongside the system prompt.")
+    ]
+    response_schema: Annotated[
+        Literal["default", "income_cashflow_expense"],
+        msgspec.Meta(description="Schema profile the agent should satisfy."),
+    ] = "income_cashflow_expense"
+    metadata: Annotated[
+        dict[str, str] | None, msgspec.Meta(description="Optional metadata stored with the run.")
+    ] = None
 
 
 class AgentRunResponse(BaseModel):
     """Response returned once an agent run is created."""
 
+    model_config = _MODEL_CONFIG
+
     run_id: str
     status: Literal["queued", "running", "completed", "failed", "cancelled"]
     thread_id: str
     started_at: datetime
-    dashboard_url: HttpUrl | None = None
+    dashboard_url: str | None = None
     assistant_id: str | None = Field(
         default=None, description="Assistant identifier used for the run."
     )
@@ -51,3 +66,21 @@ class AgentRunResponse(BaseModel):
     metadata: dict[str, str] | None = Field(
         default=None, description="Caller-supplied metadata stored alongside the run."
     )
+
+
+class RequestErrorDetail(BaseModel):
+    """Single validation failure, mirroring FastAPI's error entries."""
+
+    model_config = _MODEL_CONFIG
+
+    loc: list[str | int]
+    msg: str
+    type: str
+
+
+class RequestErrorResponse(BaseModel):
+    """Body returned when a request payload cannot be decoded or validated."""
+
+    model_config = _MODEL_CONFIG
+
+    detail: list[RequestErrorDetail]
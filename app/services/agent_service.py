@@ -4,42 +4,127 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
+import os
+from collections.abc import AsyncIterator, Mapping
+from types import MappingProxyType
 from typing import Any
 
 import httpx
+import orjson
 from fastapi import UploadFile
 
-from app.agents import get_response_format
+from app.agents import RESPONSE_FORMAT_BYTES
 from app.config import Settings
 from app.schemas import AgentRunRequest
 from app.storage import MetadataStore, RunRecord, UploadRecord
 
 logger = logging.getLogger(__name__)
 
+_UTC = dt.timezone.utc
+
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# HTML5 form encoding for multipart parameter values, matching what httpx applies to filenames.
+_FORM_PARAM_ESCAPES = {ord('"'): "%22", ord("\\"): "\\\\"} | {
+    code: f"%{code:02X}" for code in range(0x20) if code != 0x1B
+}
+
+_DEFAULT_INSTRUCTIONS = (
+    "Read the uploaded spreadsheets and produce the structured JSON outputs defined by the schema."
+)
+
+# Profiles without a response_format are absent, so lookups yield None and the field is dropped.
+_RESPONSE_FORMAT_FRAGMENTS: dict[str, orjson.Fragment] = {
+    profile: orjson.Fragment(payload) for profile, payload in RESPONSE_FORMAT_BYTES.items()
+}
+
+# The user message text never changes, so it is serialized once and spliced into each thread body.
+_USER_MESSAGE_CONTENT = orjson.Fragment(
+    orjson.dumps(
+        [
+            {
+                "type": "text",
+                "text": "Please review the attached spreadsheets. Follow the run instructions to generate the required financial summaries.",
+            },
+        ]
+    )
+)
+
+
+async def _stream_upload(file: UploadFile, head: bytes, tail: bytes) -> AsyncIterator[bytes]:
+    """Yield a multipart body around the upload without buffering the whole file."""
+    yield head
+    # UploadFile.read serves in-memory files inline and hands on-disk reads to the threadpool.
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        yield chunk
+    yield tail
+
 
 class AgentService:
     """High-level coordination layer for OpenAI Agents workflows."""
 
-    def __init__(self, settings: Settings, store: MetadataStore | None = None):
+    def __init__(
+        self,
+        settings: Settings,
+        client: httpx.AsyncClient,
+        store: MetadataStore | None = None,
+    ):
         self._settings = settings
+        self._client = client
         self._store = store
-        self._base_url = settings.openai_base_url.rstrip("/")
+        # Built once per service; None defers the missing-key error to the first OpenAI call.
+        self._headers: Mapping[str, str] | None = None
+        self._json_headers: Mapping[str, str] | None = None
+        if settings.openai_api_key:
+            headers = {
+                "Authorization": f"Bearer {settings.openai_api_key}",
+                "OpenAI-Beta": "assistants=v2",
+            }
+            self._headers = MappingProxyType(headers)
+            self._json_headers = MappingProxyType({**headers, "Content-Type": "application/json"})
 
     async def upload_source(self, file: UploadFile, provider: str | None) -> dict[str, Any]:
         """Upload a source file to OpenAI's Files API and persist metadata."""
-        headers = self._build_headers()
-        contents = await file.read()
+        headers = self._headers
+        if headers is None:
+            raise RuntimeError("OPENAI_API_KEY is not configured.")
         filename = file.filename or "upload"
         content_type = file.content_type or "application/octet-stream"
 
-        data = {"purpose": "assistants"}
-        files = {"file": (filename, contents, content_type)}
+        # httpx's own encoder probes file objects with fileno(), which rolls a spooled upload over
+        # to disk, so the multipart body is streamed by hand. Starlette's form parser records the
+        # size and rewinds the file; seek/tell (which never force a rollover) cover other callers.
+        size = file.size
+        if size is None:
+            source = file.file
+            source.seek(0, 2)
+            size = source.tell()
+            await file.seek(0)
+
+        boundary = os.urandom(16).hex()
+        head = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+            "assistants\r\n"
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; '
+            f'filename="{filename.translate(_FORM_PARAM_ESCAPES)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        upload_headers = {
+            **headers,
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(head) + size + len(tail)),
+        }
 
-        logger.info("Uploading file '%s' (%d bytes) to OpenAI Files API", filename, len(contents))
+        logger.info("Uploading file '%s' (%d bytes) to OpenAI Files API", filename, size)
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, headers=headers, timeout=60.0) as client:
-                response = await client.post("/files", data=data, files=files)
-                response.raise_for_status()
+            response = await self._client.post(
+                "/files", headers=upload_headers, content=_stream_upload(file, head, tail)
+            )
+            logger.debug("OpenAI Files API responded over %s", response.http_version)
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             error_body = exc.response.text[:500]
             logger.error(
@@ -52,30 +137,30 @@ class AgentService:
             logger.error("Failed to reach OpenAI Files API: %s", exc, exc_info=True)
             raise RuntimeError(f"Failed to reach OpenAI Files API: {exc}") from exc
 
-        payload = response.json()
+        payload = orjson.loads(response.content)
         file_id = payload.get("id")
         if not file_id:
             logger.error("OpenAI Files API response missing file id: %s", payload)
             raise RuntimeError("OpenAI Files API response did not include a file id.")
-        uploaded_at = dt.datetime.now(tz=dt.timezone.utc)
+        uploaded_at = dt.datetime.now(_UTC)
 
         result = {
             "file_id": file_id,
             "filename": payload.get("filename", filename),
             "provider": provider,
             "content_type": content_type,
-            "bytes": len(contents),
+            "bytes": size,
             "uploaded_at": uploaded_at,
         }
 
         if self._store and file_id:
-            await self._store.log_upload(
+            self._store.log_upload(
                 UploadRecord(
                     file_id=file_id,
                     filename=result["filename"],
                     provider=provider,
                     content_type=content_type,
-                    bytes=len(contents),
+                    bytes=size,
                     uploaded_at=uploaded_at,
                 )
             )
@@ -84,55 +169,35 @@ class AgentService:
 
     async def start_agent_run(self, request: AgentRunRequest) -> dict[str, Any]:
         """Start an OpenAI Agent run with structured output enforcement."""
-        headers = self._build_headers()
+        headers = self._json_headers
+        if headers is None:
+            raise RuntimeError("OPENAI_API_KEY is not configured.")
         assistant_id = self._settings.openai_assistant_id
         if not assistant_id:
             raise RuntimeError("OPENAI_ASSISTANT_ID is not configured.")
 
         message_payload = {
             "role": "user",
-            "content": [
-                {
-                    "type": "text",
-                    "text": "Please review the attached spreadsheets. Follow the run instructions to generate the required financial summaries.",
-                },
-            ],
+            "content": _USER_MESSAGE_CONTENT,
             "attachments": [{"file_id": file_id} for file_id in request.file_ids],
         }
+        run_fields = {
+            "assistant_id": assistant_id,
+            "instructions": request.instructions.strip() or _DEFAULT_INSTRUCTIONS,
+            "metadata": request.metadata or None,
+            "response_format": _RESPONSE_FORMAT_FRAGMENTS.get(request.response_schema),
+            "thread": {"messages": [message_payload]},
+        }
+        run_body = {key: value for key, value in run_fields.items() if value is not None}
 
-        logger.info("Creating OpenAI thread with %d attachments", len(request.file_ids))
+        # Create the thread and start the run in a single round-trip.
+        logger.info("Creating OpenAI thread and run with %d attachments", len(request.file_ids))
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, headers=headers, timeout=60.0) as client:
-                thread_response = await client.post("/threads", json={"messages": [message_payload]})
-                thread_response.raise_for_status()
-                thread_payload = thread_response.json()
-                thread_id = thread_payload.get("id")
-                if not thread_id:
-                    logger.error("OpenAI Threads API response missing id: %s", thread_payload)
-                    raise RuntimeError("OpenAI Threads API response did not include a thread id.")
-
-                run_body: dict[str, Any] = {
-                    "assistant_id": assistant_id,
-                }
-
-                if request.metadata:
-                    run_body["metadata"] = request.metadata
-
-                response_format = get_response_format(request.response_schema)
-                if response_format:
-                    run_body["response_format"] = response_format
-
-                instructions_text = request.instructions.strip()
-                if instructions_text:
-                    run_body["instructions"] = instructions_text
-
-                if "instructions" not in run_body:
-                    run_body["instructions"] = (
-                        "Read the uploaded spreadsheets and produce the structured JSON outputs defined by the schema."
-                    )
-
-                run_response = await client.post(f"/threads/{thread_id}/runs", json=run_body)
-                run_response.raise_for_status()
+            run_response = await self._client.post(
+                "/threads/runs", headers=headers, content=orjson.dumps(run_body)
+            )
+            logger.debug("OpenAI Agents API responded over %s", run_response.http_version)
+            run_response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             error_body = exc.response.text[:500]
             logger.error(
@@ -145,17 +210,21 @@ class AgentService:
             logger.error("Failed to reach OpenAI Agents API: %s", exc, exc_info=True)
             raise RuntimeError(f"Failed to reach OpenAI Agents API: {exc}") from exc
 
-        run_payload = run_response.json()
+        run_payload = orjson.loads(run_response.content)
         run_id = run_payload.get("id")
         if not run_id:
             logger.error("OpenAI Agents API response missing run id: %s", run_payload)
             raise RuntimeError("OpenAI Agents API response did not include a run id.")
+        thread_id = run_payload.get("thread_id")
+        if not thread_id:
+            logger.error("OpenAI Agents API response missing thread id: %s", run_payload)
+            raise RuntimeError("OpenAI Agents API response did not include a thread id.")
         status = run_payload.get("status", "queued")
         created_at = run_payload.get("created_at")
         if isinstance(created_at, (int, float)):
-            started_at = dt.datetime.fromtimestamp(created_at, tz=dt.timezone.utc)
+            started_at = dt.datetime.fromtimestamp(created_at, _UTC)
         else:
-            started_at = dt.datetime.now(tz=dt.timezone.utc)
+            started_at = dt.datetime.now(_UTC)
 
         result = {
             "run_id": run_id,
@@ -169,7 +238,7 @@ class AgentService:
         }
 
         if self._store and run_id:
-            await self._store.log_run(
+            self._store.log_run(
                 RunRecord(
                     run_id=run_id,
                     thread_id=thread_id,
@@ -182,11 +251,3 @@ class AgentService:
             )
 
         return result
-
-    def _build_headers(self) -> dict[str, str]:
-        if not self._settings.openai_api_key:
-            raise RuntimeError("OPENAI_API_KEY is not configured.")
-        return {
-            "Authorization": f"Bearer {self._settings.openai_api_key}",
-            "OpenAI-Beta": "assistants=v2",
-        }
@@ -3,17 +3,40 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
 import logging
 import sqlite3
-from contextlib import contextmanager
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on queued writes flushed per transaction, and how long the writer
+# waits for further writes to coalesce once the first one arrives.
+_MAX_BATCH_SIZE = 64
+_BATCH_WINDOW_SECONDS = 0.005
+
+_STATEMENTS: dict[str, str] = {
+    "upload": """
+        INSERT OR REPLACE INTO uploads (
+            file_id, filename, provider, content_type, bytes, uploaded_at
+        ) VALUES (?, ?, ?, ?, ?, ?);
+    """,
+    "run": """
+        INSERT OR REPLACE INTO runs (
+            run_id, thread_id, assistant_id, status, schema_profile, metadata_json, started_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?);
+    """,
+    "run_status": "UPDATE runs SET status = ? WHERE run_id = ?;",
+}
+
 
 @dataclass(slots=True)
 class UploadRecord:
@@ -23,6 +46,10 @@ class UploadRecord:
     content_type: str
     bytes: int
     uploaded_at: datetime
+    uploaded_at_iso: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.uploaded_at_iso = self.uploaded_at.isoformat()
 
 
 @dataclass(slots=True)
@@ -34,6 +61,10 @@ class RunRecord:
     schema_profile: str | None
     metadata: dict[str, Any]
     started_at: datetime
+    started_at_iso: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.started_at_iso = self.started_at.isoformat()
 
 
 class MetadataStore:
@@ -41,106 +72,182 @@ class MetadataStore:
 
     def __init__(self, database_path: Path):
         self._database_path = database_path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Created by start() so the queue binds to the loop that runs the writer.
+        self._queue: asyncio.Queue[tuple[str, tuple[Any, ...]]] | None = None
+        self._writer: asyncio.Task[None] | None = None
+
+    def initialise(self) -> None:
+        """Open the shared connection and create tables if they do not exist."""
         self._database_path.parent.mkdir(parents=True, exist_ok=True)
-        self._initialise()
-
-    def _initialise(self) -> None:
-        with self._connect() as connection:
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS uploads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    file_id TEXT UNIQUE NOT NULL,
-                    filename TEXT NOT NULL,
-                    provider TEXT,
-                    content_type TEXT NOT NULL,
-                    bytes INTEGER NOT NULL,
-                    uploaded_at TEXT NOT NULL
-                );
-                """
-            )
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS runs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    run_id TEXT UNIQUE NOT NULL,
-                    thread_id TEXT NOT NULL,
-                    assistant_id TEXT,
-                    status TEXT NOT NULL,
-                    schema_profile TEXT,
-                    metadata_json TEXT,
-                    started_at TEXT NOT NULL
-                );
-                """
-            )
-
-    @contextmanager
-    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
-        connection = sqlite3.connect(self._database_path)
-        try:
-            yield connection
-            connection.commit()
-        finally:
-            connection.close()
-
-    async def log_upload(self, record: UploadRecord) -> None:
-        """Persist upload metadata asynchronously."""
-
-        def _write() -> None:
-            with self._connect() as connection:
-                connection.execute(
-                    """
-                    INSERT OR REPLACE INTO uploads (
-                        file_id, filename, provider, content_type, bytes, uploaded_at
-                    ) VALUES (?, ?, ?, ?, ?, ?);
-                    """,
-                    (
-                        record.file_id,
-                        record.filename,
-                        record.provider,
-                        record.content_type,
-                        record.bytes,
-                        record.uploaded_at.isoformat(),
-                    ),
+        # One autocommit connection shared across worker threads; writes are serialised by _lock.
+        connection = sqlite3.connect(
+            self._database_path, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL;")
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        connection.execute("PRAGMA temp_store=MEMORY;")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                id INTEGER PRIMARY KEY,
+                file_id TEXT UNIQUE NOT NULL,
+                filename TEXT NOT NULL,
+                provider TEXT,
+                content_type TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                uploaded_at TEXT NOT NULL
+            );
+            """
+        )
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT UNIQUE NOT NULL,
+                thread_id TEXT NOT NULL,
+                assistant_id TEXT,
+                status TEXT NOT NULL,
+                schema_profile TEXT,
+                metadata_json TEXT,
+                started_at TEXT NOT NULL
+            );
+            """
+        )
+        # Supports polling runs by status in start order and looking runs up by thread.
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_runs_status_started ON runs (status, started_at);"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_runs_thread_id ON runs (thread_id);")
+        self._connection = connection
+
+    async def start(self) -> None:
+        """Initialise the database and start the background writer task."""
+        self.initialise()
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._writer_loop(self._queue))
+
+    async def aclose(self) -> None:
+        """Flush queued writes, stop the background writer and close the connection."""
+        if self._queue is not None and self._writer is not None:
+            await self._queue.join()
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+        self._queue = None
+        self._writer = None
+        self.close()
+
+    def close(self) -> None:
+        """Close the shared connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def _writer_loop(self, queue: asyncio.Queue[tuple[str, tuple[Any, ...]]]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _BATCH_WINDOW_SECONDS
+            while len(batch) < _MAX_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except TimeoutError:
+                    break
+
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception:
+                logger.exception("Failed to persist %d metadata writes", len(batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _write_batch(self, batch: list[tuple[str, tuple[Any, ...]]]) -> None:
+        with self._lock:
+            if self._connection is None:
+                raise RuntimeError("MetadataStore has not been initialised.")
+            connection = self._connection
+            connection.execute("BEGIN;")
+            try:
+                # Consecutive writes of the same kind share one executemany call; order is preserved.
+                for kind, items in groupby(batch, key=itemgetter(0)):
+                    connection.executemany(_STATEMENTS[kind], [row for _, row in items])
+            except sqlite3.Error:
+                connection.execute("ROLLBACK;")
+                logger.warning(
+                    "Batched metadata write failed; retrying %d writes individually", len(batch)
                 )
-
+                self._write_individually(connection, batch)
+                return
+            except BaseException:
+                connection.execute("ROLLBACK;")
+                raise
+            connection.execute("COMMIT;")
+
+    @staticmethod
+    def _write_individually(
+        connection: sqlite3.Connection, batch: list[tuple[str, tuple[Any, ...]]]
+    ) -> None:
+        # Autocommit per row so one bad write is dropped without taking the rest of the batch with it.
+        for kind, row in batch:
+            try:
+                connection.execute(_STATEMENTS[kind], row)
+            except sqlite3.Error:
+                logger.exception("Dropping %s metadata write %r", kind, row)
+
+    def _enqueue(self, item: tuple[str, tuple[Any, ...]]) -> None:
+        # The queue is unbounded, so enqueueing never blocks the caller.
+        if self._queue is None:
+            raise RuntimeError("MetadataStore has not been started.")
+        self._queue.put_nowait(item)
+
+    def log_upload(self, record: UploadRecord) -> None:
+        """Queue upload metadata for the background writer."""
         logger.debug("Persisting upload metadata for file_id=%s", record.file_id)
-        await asyncio.to_thread(_write)
-
-    async def log_run(self, record: RunRecord) -> None:
-        """Persist run metadata asynchronously."""
-
-        def _write() -> None:
-            with self._connect() as connection:
-                connection.execute(
-                    """
-                    INSERT OR REPLACE INTO runs (
-                        run_id, thread_id, assistant_id, status, schema_profile, metadata_json, started_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?);
-                    """,
-                    (
-                        record.run_id,
-                        record.thread_id,
-                        record.assistant_id,
-                        record.status,
-                        record.schema_profile,
-                        json.dumps(record.metadata, separators=(",", ":")),
-                        record.started_at.isoformat(),
-                    ),
-                )
+        self._enqueue(
+            (
+                "upload",
+                (
+                    record.file_id,
+                    record.filename,
+                    record.provider,
+                    record.content_type,
+                    record.bytes,
+                    record.uploaded_at_iso,
+                ),
+            )
+        )
 
+    def log_run(self, record: RunRecord) -> None:
+        """Queue run metadata for the background writer."""
         logger.debug("Persisting run metadata for run_id=%s", record.run_id)
-        await asyncio.to_thread(_write)
-
-    async def update_run_status(self, run_id: str, status: str) -> None:
-        """Update run status when polling results (placeholder for future use)."""
-
-        def _update() -> None:
-            with self._connect() as connection:
-                connection.execute(
-                    "UPDATE runs SET status = ? WHERE run_id = ?;",
-                    (status, run_id),
-                )
+        self._enqueue(
+            (
+                "run",
+                (
+                    record.run_id,
+                    record.thread_id,
+                    record.assistant_id,
+                    record.status,
+                    record.schema_profile,
+                    orjson.dumps(record.metadata).decode(),
+                    record.started_at_iso,
+                ),
+            )
+        )
 
+    def update_run_status(self, run_id: str, status: str) -> None:
+        """Queue a run status update when polling results (placeholder for future use)."""
         logger.debug("Updating run status run_id=%s status=%s", run_id, status)
-        await asyncio.to_thread(_update)
+        self._enqueue(("run_status", (status, run_id)))
@@ -0,0 +1,11 @@
+"""Shared test setup."""
+
+import os
+import tempfile
+
+# Importing the app package builds the application and caches its settings, so fix them before
+# any test module imports it: a scratch data directory and placeholder OpenAI credentials
+# (tests swap in httpx.MockTransport, so nothing reaches the network).
+os.environ["DATA_DIRECTORY"] = tempfile.mkdtemp(prefix="accounting-tool-tests-")
+os.environ["OPENAI_API_KEY"] = "sk-test"
+os.environ["OPENAI_ASSISTANT_ID"] = "asst-test"
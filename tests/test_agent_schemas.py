@@ -0,0 +1,57 @@
+"""Tests for validating agent output against the schema profiles."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import fastjsonschema
+import pytest
+
+from app.agents import validate_agent_output
+
+
+def _financial_report() -> dict[str, Any]:
+    return {
+        "income_statement": {
+            "periods": [
+                {
+                    "label": "2024-Q1",
+                    "revenue": 1000.0,
+                    "cogs": 400.0,
+                    "gross_profit": 600.0,
+                    "operating_expenses": 250.0,
+                    "operating_income": 350.0,
+                    "other_net": -10.0,
+                    "taxes": 70.0,
+                    "net_income": 270.0,
+                    "margins": {"gross": 0.6, "operating": 0.35, "net": 0.27},
+                }
+            ]
+        },
+        "cash_flow": {"operating": 300.0, "investing": -50.0, "financing": 0.0, "net_change": 250.0},
+        "expense_breakdown": {
+            "by_category": [{"label": "Rent", "total": 150.0}],
+            "by_vendor": [{"label": "Landlord LLC", "total": 150.0}],
+            "by_month": [{"label": "2024-01", "total": 50.0}],
+        },
+    }
+
+
+def test_valid_report_is_returned() -> None:
+    report = _financial_report()
+
+    assert validate_agent_output("income_cashflow_expense", report) == report
+
+
+def test_report_missing_cash_flow_is_rejected() -> None:
+    report = _financial_report()
+    del report["cash_flow"]
+
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate_agent_output("income_cashflow_expense", report)
+
+
+def test_default_profile_passes_data_through() -> None:
+    data = {"anything": ["goes"]}
+
+    assert validate_agent_output("default", data) is data
@@ -0,0 +1,119 @@
+"""Tests for the OpenAI payloads AgentService puts on the wire."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+from starlette.formparsers import MultiPartParser
+
+import app.main
+from app.main import create_app
+
+_UPLOAD_FILENAME = "ledger Q1 é.csv"
+
+
+class FakeOpenAI:
+    """Records requests and answers the Files and Runs endpoints."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/files"):
+            return httpx.Response(200, json={"id": "file-1", "filename": _UPLOAD_FILENAME})
+        if request.url.path.endswith("/threads/runs"):
+            return httpx.Response(
+                200,
+                json={
+                    "id": "run-1",
+                    "thread_id": "thread-1",
+                    "status": "queued",
+                    "created_at": 1_700_000_000,
+                    "assistant_id": "asst-test",
+                },
+            )
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def openai() -> FakeOpenAI:
+    return FakeOpenAI()
+
+
+@pytest.fixture
+def client(openai: FakeOpenAI, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    transport = httpx.MockTransport(openai)
+    monkeypatch.setattr(
+        app.main.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=transport)
+    )
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+def _parse_multipart(request: httpx.Request) -> tuple[str, str, str, bytes]:
+    async def body() -> Iterator[bytes]:
+        yield request.content
+
+    async def parse() -> tuple[str, str, str, bytes]:
+        headers = Headers(raw=[(b"content-type", request.headers["content-type"].encode())])
+        form = await MultiPartParser(headers, body()).parse()
+        upload = form["file"]
+        return form["purpose"], upload.filename, upload.content_type, await upload.read()
+
+    return asyncio.run(parse())
+
+
+@pytest.mark.parametrize("size", [8, 200_000, 2_000_000])
+def test_upload_streams_a_well_formed_multipart_body(
+    client: TestClient, openai: FakeOpenAI, size: int
+) -> None:
+    data = (b"date,amount\n" * (size // 12 + 1))[:size]
+
+    response = client.post(
+        "/api/uploads", files={"file": (_UPLOAD_FILENAME, data, "text/csv")}
+    )
+
+    assert response.status_code == 201
+    assert response.json()["bytes"] == size
+    (request,) = openai.requests
+    assert request.url.path == "/v1/files"
+    assert int(request.headers["content-length"]) == len(request.content)
+    assert _parse_multipart(request) == ("assistants", _UPLOAD_FILENAME, "text/csv", data)
+
+
+@pytest.mark.parametrize(
+    ("response_schema", "has_response_format"),
+    [("income_cashflow_expense", True), ("default", False)],
+)
+def test_run_is_created_in_a_single_threads_runs_call(
+    client: TestClient, openai: FakeOpenAI, response_schema: str, has_response_format: bool
+) -> None:
+    response = client.post(
+        "/api/runs",
+        json={"file_ids": ["file-1"], "instructions": "   ", "response_schema": response_schema},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["thread_id"] == "thread-1"
+    assert response.json()["run_id"] == "run-1"
+
+    (request,) = openai.requests
+    assert request.url.path == "/v1/threads/runs"
+    body = httpx.Response(200, content=request.content).json()
+    assert body["instructions"] == (
+        "Read the uploaded spreadsheets and produce the structured JSON outputs defined by the schema."
+    )
+    assert ("response_format" in body) is has_response_format
+    if has_response_format:
+        assert body["response_format"]["json_schema"]["name"] == "financial_reports"
+    assert "metadata" not in body
+    (message,) = body["thread"]["messages"]
+    assert message["attachments"] == [{"file_id": "file-1"}]
+    assert message["content"][0]["type"] == "text"
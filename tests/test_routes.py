@@ -0,0 +1,77 @@
+"""Tests for request decoding on the API routes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize(
+    ("body", "loc", "error_type", "message"),
+    [
+        (
+            b'{"file_ids": [], "instructions": "x"}',
+            ["body", "file_ids"],
+            "value_error",
+            "length >= 1",
+        ),
+        (
+            b'{"file_ids": [1], "instructions": "x"}',
+            ["body", "file_ids", 0],
+            "value_error",
+            "Expected `str`",
+        ),
+        (
+            b'{"file_ids": ["f1"], "instructions": "x", "bogus": 1}',
+            ["body", "bogus"],
+            "value_error",
+            "unknown field",
+        ),
+        (b'{"file_ids": ["f1"]}', ["body", "instructions"], "value_error", "missing required field"),
+        (
+            b'{"file_ids": ["f1"], "instructions": "x", "response_schema": "nope"}',
+            ["body", "response_schema"],
+            "value_error",
+            "Invalid enum value",
+        ),
+        (
+            b'{"file_ids": ["f1"], "instructions": "x", "metadata": {"k": 1}}',
+            ["body", "metadata"],
+            "value_error",
+            "Expected `str`",
+        ),
+        (b"{nope", ["body"], "json_invalid", "malformed"),
+    ],
+)
+def test_create_run_rejects_invalid_payloads(
+    client: TestClient, body: bytes, loc: list[str | int], error_type: str, message: str
+) -> None:
+    response = client.post(
+        "/api/runs", content=body, headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 422
+    (error,) = response.json()["detail"]
+    assert error["loc"] == loc
+    assert error["type"] == error_type
+    assert message in error["msg"]
+    assert " - at `" not in error["msg"]
+
+
+def test_create_run_documents_request_body_and_validation_error(client: TestClient) -> None:
+    operation = client.get("/openapi.json").json()["paths"]["/api/runs"]["post"]
+
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert schema["required"] == ["file_ids", "instructions"]
+    assert schema["properties"]["file_ids"]["minItems"] == 1
+    assert "422" in operation["responses"]
@@ -0,0 +1,108 @@
+"""Tests for the SQLite metadata store and its background writer."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.storage import MetadataStore, RunRecord, UploadRecord
+
+_NOW = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+
+
+def _upload(file_id: str, filename: str | None = "ledger.csv") -> UploadRecord:
+    return UploadRecord(
+        file_id=file_id,
+        filename=filename,  # type: ignore[arg-type]
+        provider=None,
+        content_type="text/csv",
+        bytes=8,
+        uploaded_at=_NOW,
+    )
+
+
+def _run(run_id: str) -> RunRecord:
+    return RunRecord(
+        run_id=run_id,
+        thread_id="thread-1",
+        assistant_id="asst-1",
+        status="queued",
+        schema_profile="income_cashflow_expense",
+        metadata={"source": "test"},
+        started_at=_NOW,
+    )
+
+
+def _rows(database_path: Path, sql: str) -> list[tuple]:
+    connection = sqlite3.connect(database_path)
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Path:
+    return tmp_path / "nested" / "metadata.db"
+
+
+def test_queued_writes_are_flushed_on_close(database_path: Path) -> None:
+    store = MetadataStore(database_path)
+
+    async def scenario() -> None:
+        await store.start()
+        for index in range(100):
+            store.log_upload(_upload(f"file-{index}"))
+        store.log_run(_run("run-1"))
+        store.update_run_status("run-1", "completed")
+        await store.aclose()
+
+    asyncio.run(scenario())
+
+    assert _rows(database_path, "SELECT COUNT(*) FROM uploads;") == [(100,)]
+    assert _rows(database_path, "SELECT run_id, status, metadata_json FROM runs;") == [
+        ("run-1", "completed", '{"source":"test"}')
+    ]
+
+
+def test_store_restarts_in_a_new_event_loop(database_path: Path) -> None:
+    store = MetadataStore(database_path)
+
+    async def session(file_id: str) -> None:
+        await store.start()
+        store.log_upload(_upload(file_id))
+        await store.aclose()
+
+    asyncio.run(session("file-1"))
+    asyncio.run(session("file-2"))
+
+    assert _rows(database_path, "SELECT file_id FROM uploads ORDER BY file_id;") == [
+        ("file-1",),
+        ("file-2",),
+    ]
+
+
+def test_failed_write_only_drops_the_offending_row(database_path: Path) -> None:
+    store = MetadataStore(database_path)
+
+    async def scenario() -> None:
+        await store.start()
+        for index in range(10):
+            store.log_upload(_upload(f"file-{index}", None if index == 4 else "ledger.csv"))
+        await store.aclose()
+
+    asyncio.run(scenario())
+
+    assert _rows(database_path, "SELECT COUNT(*) FROM uploads;") == [(9,)]
+    assert _rows(database_path, "SELECT COUNT(*) FROM uploads WHERE file_id = 'file-4';") == [(0,)]
+
+
+def test_writes_before_start_are_rejected(database_path: Path) -> None:
+    store = MetadataStore(database_path)
+
+    with pytest.raises(RuntimeError, match="not been started"):
+        store.log_upload(_upload("file-1"))